@@ -3,20 +3,18 @@ app/api/dependencies.py
 ───────────────────────
 FastAPI dependency injection.
 
-LLMClient is created once per request via Depends().
-For production scale, consider a connection pool or singleton pattern
-with proper lifecycle management (lifespan events).
+LLMClient is a singleton created in the app lifespan (app/main.py) and shared
+by every request, so the underlying httpx connection pool (keep-alive + HTTP/2)
+is reused instead of paying a TCP+TLS handshake per call.
 """
 
 from __future__ import annotations
 
+from fastapi import Request
+
 from app.services.llm_client import LLMClient
 
 
-async def get_llm_client() -> LLMClient:
-    """Yields a fresh LLMClient per request. Cleans up on response completion."""
-    client = LLMClient()
-    try:
-        yield client
-    finally:
-        await client.aclose()
+async def get_llm_client(request: Request) -> LLMClient:
+    """Returns the app-scoped LLMClient. Lifecycle is owned by the lifespan handler."""
+    return request.app.state.llm_client
@@ -8,7 +8,8 @@ POST /api/v1/generate-tests
     Returns: GenerateResponse (test cases + quality score + metadata)
 
 GET  /api/v1/examples
-    Returns predefined example user stories for quick testing.
+    Returns predefined example user stories for quick testing
+    (pre-encoded once at import, cacheable by clients).
 
 Error handling:
   • 422: Pydantic validation error (bad request body) → FastAPI default
@@ -19,7 +20,8 @@ Error handling:
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from app.core.models import GenerateRequest, GenerateResponse
 from app.api.dependencies import get_llm_client
@@ -31,13 +33,16 @@ logger = get_logger(__name__)
 
 router = APIRouter()
 
-EXAMPLES = [
+EXAMPLES = (
     {"label": "🔑 Recuperar contraseña", "story": "Como usuario quiero recuperar mi contraseña para poder acceder nuevamente al sistema."},
     {"label": "🛒 Carrito de compras",   "story": "Como cliente quiero agregar productos a mi carrito para poder comprarlos más tarde."},
     {"label": "📁 Subir archivos",       "story": "Como usuario quiero subir documentos PDF a mi perfil para tener mis archivos disponibles en la nube."},
     {"label": "🔔 Notificaciones",       "story": "Como usuario quiero recibir notificaciones push cuando hay una nueva oferta disponible."},
     {"label": "💳 Pago con tarjeta",     "story": "Como cliente quiero pagar mi orden con tarjeta de crédito para completar mi compra de forma segura."},
-]
+)
+
+# Static payload: serialized once at import, served as raw bytes on every request
+_EXAMPLES_BYTES = orjson.dumps(EXAMPLES)
 
 
 @router.post(
@@ -50,7 +55,7 @@ async def generate_tests(
     body: GenerateRequest,
     client: LLMClient = Depends(get_llm_client),
 ) -> GenerateResponse:
-    logger.info("Request received", story_length=len(body.user_story))
+    logger.debug("Request received", story_length=len(body.user_story))
 
     try:
         return await generate_test_cases(user_story=body.user_story, client=client)
@@ -68,6 +73,16 @@ async def generate_tests(
         raise HTTPException(status_code=502, detail=f"LLM returned unparseable output: {e}")
 
 
-@router.get("/examples", summary="Get example user stories", tags=["QA Engine"])
-async def get_examples() -> list[dict]:
-    return EXAMPLES
+@router.get(
+    "/examples",
+    response_model=None,
+    response_class=Response,
+    summary="Get example user stories",
+    tags=["QA Engine"],
+)
+async def get_examples() -> Response:
+    return Response(
+        content=_EXAMPLES_BYTES,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
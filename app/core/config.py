@@ -34,13 +34,36 @@ class Settings(BaseSettings):
     LLM_MAX_TOKENS: int = 2048
     LLM_TOP_P: float = 0.95
     LLM_TIMEOUT_SECONDS: int = 30
+    # Stream the completion and stop reading once EXPECTED_TEST_CASES cases are complete
+    LLM_STREAM: bool = False
+
+    # ── LLM HTTP transport (HTTP/2 to a single host) ─────────────────────────
+    # One shared client multiplexes requests over few TLS connections; these
+    # bound the pool so a traffic spike can't open unbounded sockets.
+    LLM_MAX_CONNECTIONS: int = 256
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 128
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 90
+    # Max in-flight LLM calls per process; excess requests queue instead of storming the API (429s)
+    LLM_MAX_CONCURRENCY: int = 32
 
     # ── Validation ───────────────────────────────────────────────────────────
     MAX_RETRIES: int = 2
+    # Exponential backoff between parse retries: 0.2s → 0.4s → … capped at 2s, plus
+    # up to 0.1s of jitter so concurrent retries don't hit the LLM in lockstep.
+    RETRY_BACKOFF_BASE_SECONDS: float = 0.2
+    RETRY_BACKOFF_MAX_SECONDS: float = 2.0
+    RETRY_BACKOFF_JITTER_SECONDS: float = 0.1
     MIN_TEST_CASES: int = 2
     MAX_TEST_CASES: int = 10
     EXPECTED_TEST_CASES: int = 4
 
+    # ── Response cache ───────────────────────────────────────────────────────
+    # In-process LRU keyed by sha256(normalized user story). Only high-quality
+    # responses are cached so a mediocre generation isn't served forever.
+    # RESPONSE_CACHE_SIZE=0 disables the cache.
+    RESPONSE_CACHE_SIZE: int = 512
+    RESPONSE_CACHE_MIN_SCORE: float = 0.75
+
 
 @lru_cache
 def get_settings() -> Settings:
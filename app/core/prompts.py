@@ -41,8 +41,13 @@ Reglas:
 - Responde ÚNICAMENTE con el objeto JSON — sin markdown, sin comillas invertidas, sin explicaciones."""
 
 
+# Debe pedir la misma cantidad de casos que SYSTEM_PROMPT: si difieren, el LLM duda y se
+# generan más reintentos.
+_USER_MSG_TEMPLATE = (
+    "Historia de usuario:\n{}\n\n"
+    "Genera exactamente 4 casos de prueba QA en español. Solo el JSON, sin texto adicional."
+)
+
+
 def build_user_message(user_story: str) -> str:
-    return (
-        f"Historia de usuario:\n{user_story}\n\n"
-        "Genera exactamente 3 casos de prueba QA en español. Solo el JSON, sin texto adicional."
-    )
+    return _USER_MSG_TEMPLATE.format(user_story)
@@ -4,28 +4,39 @@ Entry point: python run.py  →  http://127.0.0.1:8000
 """
 
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 from pathlib import Path
 
+import orjson
 from fastapi import FastAPI
+from fastapi.exception_handlers import http_exception_handler
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.api.routes import router
 from app.core.config import settings
+from app.services.llm_client import LLMClient
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 ROOT = Path(__file__).parent.parent   # project root (where frontend.html lives)
 
+# Health payload never changes for the process lifetime: encode it once
+_HEALTH_BYTES = orjson.dumps({"status": "ok", "version": settings.APP_VERSION})
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀  QA Engine starting", version=settings.APP_VERSION, env=settings.ENV)
     logger.info(f"🌐  Frontend → http://127.0.0.1:8000")
+    # One pooled LLMClient for the whole app: keeps TCP/TLS connections warm across requests
+    app.state.llm_client = LLMClient()
     yield
-    logger.info("🛑  QA Engine shutting down")
+    await app.state.llm_client.aclose()
+    logger.info("🛑  QA Engine shutting down", **asdict(app.state.llm_client.metrics))
 
 
 app = FastAPI(
@@ -33,6 +44,7 @@ app = FastAPI(
     version=settings.APP_VERSION,
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -56,13 +68,17 @@ async def serve_frontend():
     return JSONResponse({"detail": "frontend.html not found in project root"}, status_code=404)
 
 
-# ── Global error handler – logs unhandled exceptions and returns generic error response
+# ── Global error handler – logs unhandled exceptions and returns generic error response.
+# Known HTTPExceptions (404, 504, …) are delegated to FastAPI's handler untouched: no log,
+# no URL formatting.
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    logger.error("Unhandled exception", error=str(exc), path=str(request.url))
+    if isinstance(exc, StarletteHTTPException):
+        return await http_exception_handler(request, exc)
+    logger.error("Unhandled exception", error=str(exc), path=request.url.path)
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
 
 @app.get("/health", tags=["Health"])
-async def health_check():
-    return {"status": "ok", "version": settings.APP_VERSION}
+async def health_check() -> Response:
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
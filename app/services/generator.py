@@ -3,13 +3,21 @@ app/services/generator.py
 ─────────────────────────
 Orchestrator: coordinates LLM call → validation → retry → scoring.
 Estrategia de reintento: 
-* Hasta MAX_RETRIES intentos en LLMParseError (JSON mal formado). 
+* Hasta MAX_RETRIES intentos en LLMParseError (JSON mal formado), con backoff exponencial
+  + jitter entre intentos (RETRY_BACKOFF_* en config) para no reintentar en ráfaga.
 * En LLMTimeoutError / LLMNetworkError → falla rápidamente (sin reintento; problema de infraestructura). 
 * Tras agotar todos los reintentos → se envía a la capa de API para HTTP 502
+Cache: las respuestas con quality.score >= RESPONSE_CACHE_MIN_SCORE se guardan en un LRU
+en memoria (por proceso) indexado por sha256 de la historia normalizada; un hit evita el LLM.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import random
+from collections import OrderedDict
+
 from app.core.config import settings
 from app.core.models import GenerateResponse, ResponseMeta
 from app.services.llm_client import LLMClient, LLMError, LLMParseError, LLMTimeoutError, LLMNetworkError
@@ -19,6 +27,23 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# sha256(normalized story) → response already marked as cached (LRU order: oldest first)
+_cache: OrderedDict[bytes, GenerateResponse] = OrderedDict()
+
+
+def _cache_key(user_story: str) -> bytes:
+    return hashlib.sha256(user_story.strip().lower().encode()).digest()
+
+
+def _cache_store(key: bytes, response: GenerateResponse) -> None:
+    if settings.RESPONSE_CACHE_SIZE <= 0 or response.quality.score < settings.RESPONSE_CACHE_MIN_SCORE:
+        return
+    meta = response.meta.model_copy(update={"pipeline": response.meta.pipeline + " (cached)"})
+    _cache[key] = response.model_copy(update={"meta": meta})
+    _cache.move_to_end(key)
+    while len(_cache) > settings.RESPONSE_CACHE_SIZE:
+        _cache.popitem(last=False)
+
 
 async def generate_test_cases(user_story: str, client: LLMClient) -> GenerateResponse:
     """
@@ -28,16 +53,24 @@ async def generate_test_cases(user_story: str, client: LLMClient) -> GenerateRes
        En LLMTimeoutError / LLMNetworkError → falla rápidamente (sin reintento; problema de infraestructura)
        LLMParseError: parseo fallido después de todos los reintentos.
     """
+    key = _cache_key(user_story)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        logger.info("Cache hit", quality_score=cached.quality.score)
+        return cached
+
     attempts = 0
     last_error: Exception | None = None
+    delay = settings.RETRY_BACKOFF_BASE_SECONDS
 
     for attempt in range(1, settings.MAX_RETRIES + 2):  # +1 for zero-indexed range
         attempts = attempt
-        logger.info("Generation attempt", attempt=attempt, max=settings.MAX_RETRIES + 1)
+        logger.debug("Generation attempt", attempt=attempt, max=settings.MAX_RETRIES + 1)
 
         try:
             # ── Step 1: Call LLM 
-            llm_resp = await client.generate(user_story)
+            llm_resp = await client.generate(user_story, stream=settings.LLM_STREAM)
 
             # ── Step 2: Parse + Validate + Repair
             llm_output, was_repaired = parse_and_validate(
@@ -57,7 +90,7 @@ async def generate_test_cases(user_story: str, client: LLMClient) -> GenerateRes
                 was_repaired=was_repaired,
             )
 
-            return GenerateResponse(
+            response = GenerateResponse(
                 test_cases=llm_output.test_cases,
                 quality=quality,
                 meta=ResponseMeta(
@@ -67,12 +100,18 @@ async def generate_test_cases(user_story: str, client: LLMClient) -> GenerateRes
                     attempts=attempts,
                 ),
             )
+            _cache_store(key, response)
+            return response
 
         except LLMParseError as e:
             last_error = e
             logger.warning("Parse error on attempt", attempt=attempt, error=str(e))
             if attempt <= settings.MAX_RETRIES:
-                logger.info("Retrying…")
+                backoff = delay + random.uniform(0, settings.RETRY_BACKOFF_JITTER_SECONDS)
+                logger.info("Retrying…", backoff_seconds=round(backoff, 3))
+                client.record_retry()
+                await asyncio.sleep(backoff)
+                delay = min(delay * 2, settings.RETRY_BACKOFF_MAX_SECONDS)
                 continue
             break
 
@@ -5,8 +5,10 @@ Thin async wrapper around the OpenAI Chat Completions API.
 
 Responsabilidades:
   • Send prompt, recibe raw text + stop_reason (stop | length | content_filter | …)
+  • Streaming opcional (SSE): corta el stream en cuanto llegan EXPECTED_TEST_CASES casos completos
   • Muestra stop_reason para diagnóstico (considerar aumentar max_tokens o revisar heurística de reparación)
   • Handle timeouts, network errors, HTTP errors consistently
+  • Limita las llamadas concurrentes (LLM_MAX_CONCURRENCY) y lleva contadores en `metrics`
   • parsing, scoring – single responsibility
 """
 
@@ -16,6 +18,7 @@ import asyncio
 from dataclasses import dataclass
 
 import httpx
+import orjson
 
 from app.core.config import settings
 from app.core.prompts import SYSTEM_PROMPT, build_user_message
@@ -25,6 +28,25 @@ logger = get_logger(__name__)
 
 OPENAI_URL = "https://api.openai.com/v1/chat/completions"
 
+# Static parts of every request, built once at import (treat as read-only)
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+_STATIC_PAYLOAD = {
+    "model": settings.OPENAI_MODEL,
+    "temperature": settings.LLM_TEMPERATURE,
+    "max_tokens": settings.LLM_MAX_TOKENS,
+    "top_p": settings.LLM_TOP_P,
+}
+
+
+@dataclass
+class LLMClientMetrics:
+    """Process-wide counters for ops (logged per request and at shutdown)."""
+    queued: int = 0         # waiting for a LLM_MAX_CONCURRENCY slot
+    inflight: int = 0       # holding a slot (never above LLM_MAX_CONCURRENCY)
+    requests: int = 0
+    retries: int = 0        # structural retries, see record_retry()
+    rate_limited: int = 0   # HTTP 429 responses
+
 
 @dataclass
 class LLMResponse:
@@ -34,56 +56,135 @@ class LLMResponse:
 
 
 class LLMClient:
-    """Async OpenAI client. Instantiate once (e.g. as a dependency)."""
+    """Async OpenAI client. Instantiate once per app (see lifespan in app/main.py)."""
 
     def __init__(self) -> None:
+        self.metrics = LLMClientMetrics()
+        self._sem = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
         self._client = httpx.AsyncClient(
+            http2=True,
             timeout=httpx.Timeout(settings.LLM_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
             headers={
                 "Authorization": f"Bearer {settings.OPENAI_API_KEY}",
                 "Content-Type": "application/json",
             },
         )
 
-    async def generate(self, user_story: str) -> LLMResponse:
+    async def generate(self, user_story: str, stream: bool = False) -> LLMResponse:
+        """
+        Sends the user story and returns the completion text + stop_reason.
+
+        stream=True reads the completion as SSE and stops as soon as
+        EXPECTED_TEST_CASES complete test cases have arrived, closing the JSON
+        and dropping the rest of the stream (less latency and fewer tokens).
+        """
         payload = {
-            "model": settings.OPENAI_MODEL,
-            "temperature": settings.LLM_TEMPERATURE,
-            "max_tokens": settings.LLM_MAX_TOKENS,
-            "top_p": settings.LLM_TOP_P,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": build_user_message(user_story)},
-            ],
+            **_STATIC_PAYLOAD,
+            "messages": [_SYSTEM_MSG, {"role": "user", "content": build_user_message(user_story)}],
         }
 
+        metrics = self.metrics
+        metrics.requests += 1
         logger.info(
             "LLM request",
             model=settings.OPENAI_MODEL,
             temperature=settings.LLM_TEMPERATURE,
             max_tokens=settings.LLM_MAX_TOKENS,
+            stream=stream,
+            queued=metrics.queued,
+            inflight=metrics.inflight,
         )
 
+        # Explicit acquire so the wait behind the semaphore is counted separately
+        metrics.queued += 1
+        try:
+            await self._sem.acquire()
+        finally:
+            metrics.queued -= 1
+        metrics.inflight += 1
         try:
-            resp = await self._client.post(OPENAI_URL, json=payload)
+            llm_resp = await (self._post_stream(payload) if stream else self._post(payload))
         except httpx.TimeoutException as exc:
             raise LLMTimeoutError(f"LLM request timed out after {settings.LLM_TIMEOUT_SECONDS}s") from exc
         except httpx.RequestError as exc:
             raise LLMNetworkError(f"Network error: {exc}") from exc
+        finally:
+            metrics.inflight -= 1
+            self._sem.release()
 
+        logger.info("LLM response received", stop_reason=llm_resp.stop_reason, chars=len(llm_resp.text))
+        return llm_resp
+
+    async def _post(self, payload: dict) -> LLMResponse:
+        # Pre-encoded body: orjson instead of httpx's stdlib json serializer
+        resp = await self._client.post(OPENAI_URL, content=orjson.dumps(payload))
         if resp.status_code != 200:
-            body = resp.text
-            logger.error("OpenAI API error", status=resp.status_code, body=body[:500])
-            raise LLMAPIError(f"OpenAI returned HTTP {resp.status_code}: {body[:200]}")
+            self._raise_api_error(resp.status_code, resp.text)
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         choice = data["choices"][0]
-        text = choice["message"]["content"] or ""
-        stop_reason = choice.get("finish_reason", "unknown")
-        model_used = data.get("model", settings.OPENAI_MODEL)
+        return LLMResponse(
+            text=choice["message"]["content"] or "",
+            stop_reason=choice.get("finish_reason", "unknown"),
+            model=data.get("model", settings.OPENAI_MODEL),
+        )
 
-        logger.info("LLM response received", stop_reason=stop_reason, chars=len(text))
-        return LLMResponse(text=text, stop_reason=stop_reason, model=model_used)
+    async def _post_stream(self, payload: dict) -> LLMResponse:
+        content = orjson.dumps({**payload, "stream": True})
+        # Imported here: validator imports this module's exceptions at import time
+        from app.services.validator import _JsonScanner
+
+        parts: list[str] = []
+        scanner = _JsonScanner()
+        stop_reason = "unknown"
+        model_used = settings.OPENAI_MODEL
+
+        async with self._client.stream("POST", OPENAI_URL, content=content) as resp:
+            if resp.status_code != 200:
+                self._raise_api_error(resp.status_code, (await resp.aread()).decode(errors="replace"))
+
+            async for line in resp.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = orjson.loads(data)
+                except orjson.JSONDecodeError as exc:
+                    raise LLMParseError(f"Malformed SSE chunk: {data[:200]!r}") from exc
+                model_used = chunk.get("model", model_used)
+                if not chunk.get("choices"):
+                    continue
+                choice = chunk["choices"][0]
+                stop_reason = choice.get("finish_reason") or stop_reason
+                delta = (choice.get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                parts.append(delta)
+                if scanner.feed(delta) >= settings.EXPECTED_TEST_CASES:
+                    # Enough complete cases: close test_cases + root object. Returning from
+                    # inside `async with` closes the response and aborts the rest of the stream.
+                    logger.info("LLM stream stopped early", test_cases=scanner.cases)
+                    text = scanner.close("".join(parts))
+                    return LLMResponse(text=text, stop_reason="stop", model=model_used)
+
+        return LLMResponse(text="".join(parts), stop_reason=stop_reason, model=model_used)
+
+    def record_retry(self) -> None:
+        """Called by the generator before retrying a structurally invalid completion."""
+        self.metrics.retries += 1
+
+    def _raise_api_error(self, status: int, body: str) -> None:
+        if status == 429:
+            self.metrics.rate_limited += 1
+        logger.error("OpenAI API error", status=status, body=body[:500])
+        raise LLMAPIError(f"OpenAI returned HTTP {status}: {body[:200]}")
 
     async def aclose(self) -> None:
         await self._client.aclose()
@@ -24,14 +24,17 @@ from typing import List
 from app.core.models import QualityDimension, QualityReport, TestCase
 
 # Patterns
-_VAGUE = re.compile(
-    r"\b(works|correct(ly)?|properly|fine|good|ok|okay|done|success|funciona|correcto|bien)\b",
-    re.IGNORECASE,
-)
-_GENERIC_PRECOND = re.compile(
-    r"^(the user is (logged in|on the app|in the system)|n/?a|none|ninguna?|no aplica)$",
-    re.IGNORECASE,
-)
+# Vague words are whole-word literals: tokenize once and do set lookups instead of a regex alternation
+_VAGUE_WORDS = frozenset({
+    "works", "correct", "correctly", "properly", "fine", "good", "ok", "okay", "done", "success",
+    "funciona", "correcto", "bien",
+})
+_WORD = re.compile(r"\w+")
+# Generic preconditions are whole-text literals: one hash lookup on the lowercased text
+_GENERIC_PRECONDITIONS = frozenset({
+    "the user is logged in", "the user is on the app", "the user is in the system",
+    "n/a", "na", "none", "ningun", "ninguna", "no aplica",
+})
 
 
 def score_test_cases(test_cases: List[TestCase]) -> QualityReport:
@@ -40,32 +43,41 @@ def score_test_cases(test_cases: List[TestCase]) -> QualityReport:
     # ── Quantity 
     qty = min(n / 3, 1.0) * 0.20
 
-    # ── Steps_depth 
-    avg_steps = sum(min(len(tc.steps) / 3, 1.0) for tc in test_cases) / n
-    steps = avg_steps * 0.25
-
-    # ── Preconditions specificity 
-    def prec_score(tc: TestCase) -> float:
-        p = tc.preconditions.strip()
-        if _GENERIC_PRECOND.match(p):
-            return 0.2
-        return 1.0 if len(p) > 25 else 0.6
-
-    prec = sum(prec_score(tc) for tc in test_cases) / n * 0.20
+    # ── Per-case dimensions, accumulated in a single pass
+    generic_preconditions = _GENERIC_PRECONDITIONS
+    find_words = _WORD.findall
+    vague_words = _VAGUE_WORDS
+    steps_sum = prec_sum = res_sum = 0.0
+    words: set[str] = set()
 
-    # ── Expected result specificity 
-    def res_score(tc: TestCase) -> float:
-        vague_count = len(_VAGUE.findall(tc.expected_result))
-        if vague_count == 0 and len(tc.expected_result) > 35:
-            return 1.0
-        if vague_count <= 1:
-            return 0.7
-        return 0.3
+    for tc in test_cases:
+        # Steps_depth
+        steps_sum += min(len(tc.steps) / 3, 1.0)
 
-    res = sum(res_score(tc) for tc in test_cases) / n * 0.20
-
-    # ── Title diversity
-    words = {w for tc in test_cases for w in tc.title.lower().split()}
+        # Preconditions specificity
+        p = tc.preconditions.strip()
+        if p.lower() in generic_preconditions:
+            prec_sum += 0.2
+        else:
+            prec_sum += 1.0 if len(p) > 25 else 0.6
+
+        # Expected result specificity
+        expected = tc.expected_result
+        vague_count = sum(1 for w in find_words(expected.lower()) if w in vague_words)
+        if vague_count == 0 and len(expected) > 35:
+            res_sum += 1.0
+        elif vague_count <= 1:
+            res_sum += 0.7
+        else:
+            res_sum += 0.3
+
+        # Title diversity
+        words.update(tc.title.lower().split())
+
+    avg_steps = steps_sum / n
+    steps = avg_steps * 0.25
+    prec = prec_sum / n * 0.20
+    res = res_sum / n * 0.20
     div = min(len(words) / (n * 3), 1.0) * 0.15
 
     # ── Aggregate
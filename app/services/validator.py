@@ -6,13 +6,12 @@ Validación estructural y reparación de JSON para la salida del LLM
 Pasos de validación y reparación:
   1. Eliminar los delimitadores de markdown (```json … ```) si existen.
   2. Intentar JSON.parse directamente. Si falla y stop_reason es "length", proceder a reparación.
-  3. Reparación heurística para JSON truncado:
-     a. Eliminar fragmentos de string incompletos al final.
-     b. Eliminar claves sin valor al final (e.g. , "expected_result":).
-     c. Eliminar claves incompletas (sin comillas de cierre).
-     d. Eliminar comas finales antes de } o ].
-     e. Contar delimitadores { [ y cerrar los que falten al final.
-  4. Validar la estructura resultante contra el modelo Pydantic LLMOutput.
+  3. Reparación heurística para JSON truncado (un solo recorrido del texto):
+     a. Cortar después del último caso de prueba completo (descarta el caso a medio escribir).
+     b. Eliminar comas finales antes de } o ].
+     c. Cerrar los [ y { que seguían abiertos en el corte, en orden inverso de apertura.
+  4. Validar la estructura resultante contra el modelo Pydantic LLMOutput (en el camino
+     directo, parseo y validación ocurren en una sola pasada de pydantic-core).
   5. Si todo falla, lanzar LLMParseError con detalles diagnósticos para facilitar debugging 
   (stop_reason, fragmento de raw, error específico).
   
@@ -22,9 +21,9 @@ Pasos de validación y reparación:
 
 from __future__ import annotations
 
-import json
 import re
 
+import orjson
 from pydantic import ValidationError
 
 from app.core.models import LLMOutput
@@ -33,72 +32,121 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns
+_RE_FENCES = re.compile(r"```(?:json)?|```")
+
+_CLOSERS = {"{": "}", "[": "]"}
+_WHITESPACE = frozenset(" \t\r\n")
+
 
 def strip_fences(raw: str) -> str:
     """ Elimina las comillas invertidas de markdown que el LLM a veces agrega a pesar de las instrucciones. """
-    return re.sub(r"```(?:json)?|```", "", raw).strip()
+    if "```" not in raw:  # substring scan in C; skips the regex engine in the common case
+        return raw.strip()
+    return _RE_FENCES.sub("", raw).strip()
 
 
 def repair_truncated_json(raw: str) -> dict:
     """
     Intenta salvar una cadena JSON truncada a mitad de camino (stop_reason='length').
 
-    Algoritmo:
-        1. Eliminar la cadena literal abierta/incompleta al final.
-        2. Eliminar la clave final que no tiene valor.
-        3. Eliminar la clave final incompleta (sin comillas de cierre).
-        4. Eliminar comas finales antes de los delimitadores de cierre.
-        5. Contar las { y [ no emparejadas y cerrarlas en orden inverso.
-        6. Limpieza final de comas después de cerrar.
+    Algoritmo (un solo recorrido con _JsonScanner, ignorando el contenido de los strings):
+        1. Registrar el último corte seguro: justo después de un } o ] que vuelve a
+           profundidad <= 2, es decir un caso completo de test_cases, el propio array
+           o el objeto raíz. Un caso a medio escribir queda fuera del corte entero.
+        2. Registrar las comas que preceden directamente a } o ] para eliminarlas.
+        3. Truncar en el corte y cerrar los contenedores abiertos en ese punto,
+           del más interno al más externo.
     """
     s = strip_fences(raw)
 
     # Try as-is first
     try:
-        return json.loads(s)
-    except json.JSONDecodeError:
+        return orjson.loads(s)
+    except orjson.JSONDecodeError:
         pass
 
-    # Strip truncated string at end
-    s = re.sub(r',?\s*"(?:[^"\\]|\\.)*$', "", s)
-    # Strip key with no value  e.g.  , "expected_result":
-    s = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", s)
-    # Strip incomplete key (no closing quote)
-    s = re.sub(r',?\s*"[^"]*$', "", s)
-    # Strip trailing commas before ] or }
-    s = re.sub(r",(\s*[}\]])", r"\1", s)
-    s = re.sub(r",\s*$", "", s)
-
-    # Count unmatched delimiters (state machine ignoring string contents)
-    braces = brackets = 0
-    in_str = esc = False
-    for ch in s:
-        if esc:
-            esc = False
-            continue
-        if ch == "\\" and in_str:
-            esc = True
-            continue
-        if ch == '"':
-            in_str = not in_str
-            continue
-        if in_str:
-            continue
-        if ch == "{":
-            braces += 1
-        elif ch == "}":
-            braces -= 1
-        elif ch == "[":
-            brackets += 1
-        elif ch == "]":
-            brackets -= 1
-
-    s += "]" * max(0, brackets)
-    s += "}" * max(0, braces)
-    # Final trailing-comma cleanup after closing
-    s = re.sub(r",(\s*[}\]])", r"\1", s)
-
-    return json.loads(s)  # raises JSONDecodeError if still broken
+    return _repair_json(s)
+
+
+def _repair_json(s: str) -> dict:
+    """ Recorrido de reparación de repair_truncated_json, para texto ya sin fences que no parsea tal cual. """
+    scanner = _JsonScanner()
+    scanner.feed(s)
+    return orjson.loads(scanner.close(s))  # raises orjson.JSONDecodeError if still broken
+
+
+class _JsonScanner:
+    """
+    Incremental scanner over (possibly truncated) LLM JSON, fed in chunks.
+
+    Tracks open containers while ignoring delimiters inside strings. In
+    {"test_cases": [ {...}, ... ]} depth 2 is inside the array, so:
+      • `cases` counts '}' closes back to depth 2, i.e. complete test cases;
+      • `cut` is the offset just after the last close back to depth <= 2
+        (a whole test case, the test_cases array or the root object).
+    close(text) turns the text fed so far into a complete document: it keeps
+    text[:cut], drops trailing commas and closes what was open at the cut.
+    Shared by the repair path here and by the SSE reader in llm_client.
+    """
+
+    def __init__(self) -> None:
+        self.cases = 0
+        self.cut = 0
+        self._cut_stack: list[str] = []        # containers still open at `cut`
+        self._trailing_commas: list[int] = []  # commas directly before } or ]
+        self._stack: list[str] = []            # open containers, innermost last
+        self._offset = 0
+        self._last_comma = -1
+        self._prev = ""                        # previous significant char outside strings
+        self._in_str = False
+        self._esc = False
+
+    def feed(self, chunk: str) -> int:
+        """ Scans the next chunk of text and returns the number of complete test cases so far. """
+        stack, offset = self._stack, self._offset
+        last_comma, prev, in_str, esc = self._last_comma, self._prev, self._in_str, self._esc
+        for i, ch in enumerate(chunk):
+            if in_str:
+                if esc:
+                    esc = False
+                elif ch == "\\":
+                    esc = True
+                elif ch == '"':
+                    in_str = False
+                    prev = ch
+                continue
+            if ch in _WHITESPACE:
+                continue
+            if ch == '"':
+                in_str = True
+            elif ch == ",":
+                last_comma = offset + i
+            elif ch == "{" or ch == "[":
+                stack.append(ch)
+            elif ch == "}" or ch == "]":
+                if stack:
+                    stack.pop()
+                if prev == ",":
+                    self._trailing_commas.append(last_comma)
+                depth = len(stack)
+                if depth <= 2:
+                    if depth == 2 and ch == "}":
+                        self.cases += 1
+                    self.cut, self._cut_stack = offset + i + 1, stack.copy()
+            prev = ch
+        self._offset = offset + len(chunk)
+        self._last_comma, self._prev, self._in_str, self._esc = last_comma, prev, in_str, esc
+        return self.cases
+
+    def close(self, text: str) -> str:
+        """ text (everything fed so far) cut at `cut` and closed into a complete document. """
+        cut = self.cut
+        out = text[:cut]
+        for pos in reversed(self._trailing_commas):
+            if pos < cut:
+                out = out[:pos] + out[pos + 1:]
+        return out + "".join(_CLOSERS[c] for c in reversed(self._cut_stack))
 
 
 def parse_and_validate(raw: str, stop_reason: str) -> tuple[LLMOutput, bool]:
@@ -109,34 +157,47 @@ def parse_and_validate(raw: str, stop_reason: str) -> tuple[LLMOutput, bool]:
     Raises:
         LLMParseError: si parseo o validación falla después de todas las estrategias.
     """
-    cleaned = strip_fences(raw)
+    # Common case: the model obeyed "no markdown" → skip the fence regex entirely
+    stripped = raw.strip()
+    if stop_reason == "stop" and stripped[:1] == "{" and stripped[-1:] == "}":
+        cleaned = stripped
+    else:
+        cleaned = strip_fences(raw)
     was_repaired = False
+    direct_failed = False
 
-    # ── Strategy A: direct parse 
+    # ── Strategy A: direct parse (JSON decode + schema validation in one pydantic-core pass)
     if stop_reason != "length":
         try:
-            data = json.loads(cleaned)
-            return _validate_structure(data), False
-        except json.JSONDecodeError as e:
+            return LLMOutput.model_validate_json(cleaned), False
+        except ValidationError as e:
+            if not _is_json_error(e):
+                raise LLMParseError(f"Structural validation failed: {e}") from e
             logger.warning("Direct JSON parse failed, attempting repair", error=str(e))
+            direct_failed = True
 
-    # ── Strategy B: repair truncated JSON 
+    # ── Strategy B: repair truncated JSON (skip the as-is parse if Strategy A already failed it)
     try:
-        data = repair_truncated_json(cleaned)
+        data = _repair_json(cleaned) if direct_failed else repair_truncated_json(cleaned)
         was_repaired = True
         logger.info("JSON repaired successfully")
         return _validate_structure(data), True
-    except (json.JSONDecodeError, ValueError) as e:
+    except (orjson.JSONDecodeError, ValueError) as e:
         raise LLMParseError(
             f"JSON could not be parsed or repaired. stop_reason={stop_reason!r}. "
             f"Detail: {e}. First 300 chars of raw: {raw[:300]!r}"
         ) from e
 
 
+def _is_json_error(exc: ValidationError) -> bool:
+    """ True si el fallo es de sintaxis JSON (reparable) y no de esquema. """
+    return any(err["type"] == "json_invalid" for err in exc.errors())
+
+
 def _validate_structure(data: dict) -> LLMOutput:
     """ Valida el dict contra el esquema LLMOutput. Lanza LLMParseError en caso de fallo. """
     
     try:
-        return LLMOutput(**data)
-    except (ValidationError, TypeError) as e:
+        return LLMOutput.model_validate(data)
+    except ValidationError as e:
         raise LLMParseError(f"Structural validation failed: {e}") from e
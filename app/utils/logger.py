@@ -7,6 +7,8 @@ Why structlog?
   • Machine-parseable JSON: compatible with Datadog, CloudWatch, Loki, etc.
   • Context binding: add request_id, user_id, etc. without touching every call.
   • Zero overhead in production if level is WARNING+.
+  • Production renders with orjson and epoch timestamps; per-attempt/per-request
+    chatter is logged at DEBUG so the default INFO level drops it early.
 
 Usage:
     from app.utils.logger import get_logger
@@ -19,6 +21,7 @@ from __future__ import annotations
 import logging
 import sys
 
+import orjson
 import structlog
 
 from app.core.config import settings
@@ -28,19 +31,28 @@ def configure_logging() -> None:
     """Call once at startup."""
     log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
+    if settings.ENV == "development":
+        # Human-readable: ISO timestamps + colored console output
+        timestamper = structlog.processors.TimeStamper(fmt="iso")
+        renderer = structlog.dev.ConsoleRenderer()
+        logger_factory = structlog.PrintLoggerFactory(file=sys.stdout)
+    else:
+        # Machine-readable: epoch timestamps (no strftime) + orjson encoding straight to bytes
+        timestamper = structlog.processors.TimeStamper(fmt=None, utc=True)
+        renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        logger_factory = structlog.BytesLoggerFactory(file=sys.stdout.buffer)
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
             structlog.stdlib.add_log_level,
-            structlog.processors.TimeStamper(fmt="iso"),
+            timestamper,
             structlog.processors.StackInfoRenderer(),
-            structlog.dev.ConsoleRenderer()
-            if settings.ENV == "development"
-            else structlog.processors.JSONRenderer(),
+            renderer,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
@@ -10,10 +10,16 @@ Equivalente a:
 Por qué este archivo existe:
     En Windows es fácil abrir terminal dentro de la carpeta 'app/' por error.
     Este script siempre agrega la raíz del proyecto al sys.path correctamente.
+
+Event loop / parser HTTP:
+    uvloop (libuv) + httptools (parser C de Node.js), vía uvicorn[standard] si están instalados.
+    uvicorn[standard] no instala uvloop en Windows, cygwin ni PyPy: ahí se usa el loop
+    asyncio por defecto (y h11 si faltara httptools).
 """
 
 import sys
 import os
+from importlib.util import find_spec
 
 # Garantiza que la raíz del proyecto esté en el path
 ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -28,4 +34,6 @@ if __name__ == "__main__":
         port=8000,
         reload=True,
         reload_dirs=[ROOT],
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
     )
@@ -0,0 +1,34 @@
+"""
+tests/conftest.py
+─────────────────
+Shared pytest setup.
+
+The session fixture runs validator + scorer once before the suite so one-time
+work (module imports, pydantic-core validator/serializer setup, regex warm-up)
+is not billed to whichever test happens to run first — keeps per-test timings
+(`pytest --durations`) comparable.
+"""
+
+import json
+
+import pytest
+
+_WARMUP_JSON = json.dumps({
+    "test_cases": [
+        {
+            "title": "Warm-up case",
+            "preconditions": "User has a verified account on the login page",
+            "steps": ["Enter email", "Enter password", "Click login"],
+            "expected_result": "Dashboard is displayed with the user's name in the header",
+        }
+    ]
+})
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_services():
+    from app.services.scorer import score_test_cases
+    from app.services.validator import parse_and_validate
+
+    output, _ = parse_and_validate(_WARMUP_JSON, stop_reason="stop")
+    score_test_cases(output.test_cases)
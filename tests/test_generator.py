@@ -0,0 +1,152 @@
+"""
+tests/test_generator.py
+───────────────────────
+Unit tests for the generation pipeline: response cache and retry backoff
+(no network, no API key).
+Run with: pytest tests/ -v
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.models import GenerateResponse
+from app.services import generator
+from app.services.generator import _cache, _cache_key, _cache_store, generate_test_cases
+from app.services.llm_client import LLMParseError, LLMResponse
+
+
+VALID_JSON = (
+    '{"test_cases": [{"title": "Happy Path Login", '
+    '"preconditions": "User has a verified account with correct credentials on the login page", '
+    '"steps": ["Enter valid email address", "Enter correct password", "Click the Login button"], '
+    '"expected_result": "User is redirected to the dashboard and a welcome banner is displayed"}]}'
+)
+
+
+class StubClient:
+    """Stands in for LLMClient: returns (or raises) the queued results in order."""
+
+    def __init__(self, *results):
+        self.calls = 0
+        self.retries = 0
+        self._results = list(results)
+
+    async def generate(self, user_story: str, stream: bool = False) -> LLMResponse:
+        self.calls += 1
+        result = self._results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def record_retry(self) -> None:
+        self.retries += 1
+
+
+def ok_response() -> LLMResponse:
+    return LLMResponse(text=VALID_JSON, stop_reason="stop", model="test-model")
+
+
+def stored_response(score: float) -> GenerateResponse:
+    return GenerateResponse.model_validate({
+        "test_cases": [],
+        "quality": {
+            "score": score,
+            "label": "test",
+            "dimensions": {
+                "quantity": score, "steps_depth": score, "preconditions": score,
+                "expected_results": score, "diversity": score,
+            },
+        },
+        "meta": {"model": "test-model", "stop_reason": "stop", "was_repaired": False, "attempts": 1},
+    })
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    _cache.clear()
+    yield
+    _cache.clear()
+
+
+# ── response cache ───────────────────────────────────────────────────────────
+
+def test_cache_key_normalizes_case_and_whitespace():
+    assert _cache_key("  Como usuario quiero Entrar \n") == _cache_key("como usuario quiero entrar")
+    assert _cache_key("como usuario quiero entrar") != _cache_key("como usuario quiero salir")
+
+
+def test_cache_skips_low_quality_responses(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_MIN_SCORE", 0.75)
+    _cache_store(b"low", stored_response(0.74))
+    _cache_store(b"high", stored_response(0.75))
+    assert list(_cache) == [b"high"]
+
+
+def test_cache_disabled_when_size_is_zero(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_SIZE", 0)
+    _cache_store(b"key", stored_response(1.0))
+    assert not _cache
+
+
+def test_cache_evicts_least_recently_stored(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_SIZE", 2)
+    for key in (b"a", b"b", b"a", b"c"):   # re-storing "a" makes "b" the oldest
+        _cache_store(key, stored_response(1.0))
+    assert list(_cache) == [b"a", b"c"]
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_llm_and_marks_only_the_cached_copy(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_MIN_SCORE", 0.0)
+    client = StubClient(ok_response())
+
+    first = await generate_test_cases("Como usuario quiero entrar", client)
+    second = await generate_test_cases("  como usuario quiero ENTRAR ", client)
+
+    assert client.calls == 1
+    assert not first.meta.pipeline.endswith(" (cached)")
+    assert second.meta.pipeline == first.meta.pipeline + " (cached)"
+    assert second.test_cases == first.test_cases
+
+
+# ── retry backoff ────────────────────────────────────────────────────────────
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Records backoff sleeps instead of waiting; jitter is pinned to 0.05s."""
+    recorded = []
+
+    async def fake_sleep(seconds):
+        recorded.append(seconds)
+
+    monkeypatch.setattr(generator.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(generator.random, "uniform", lambda a, b: 0.05)
+    monkeypatch.setattr(settings, "RETRY_BACKOFF_BASE_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "RETRY_BACKOFF_MAX_SECONDS", 2.0)
+    return recorded
+
+
+@pytest.mark.asyncio
+async def test_retry_backoff_doubles_up_to_cap(monkeypatch, sleeps):
+    monkeypatch.setattr(settings, "MAX_RETRIES", 5)
+    client = StubClient(*(LLMParseError("bad json") for _ in range(6)))
+
+    with pytest.raises(LLMParseError):
+        await generate_test_cases("Como usuario quiero entrar", client)
+
+    # One sleep between attempts, none after the last one
+    assert client.calls == 6
+    assert sleeps == pytest.approx([0.25, 0.45, 0.85, 1.65, 2.05])
+    assert client.retries == 5
+
+
+@pytest.mark.asyncio
+async def test_retry_stops_backing_off_after_success(monkeypatch, sleeps):
+    monkeypatch.setattr(settings, "MAX_RETRIES", 2)
+    client = StubClient(LLMParseError("bad json"), ok_response())
+
+    response = await generate_test_cases("Como usuario quiero entrar", client)
+
+    assert response.meta.attempts == 2
+    assert sleeps == pytest.approx([0.25])
+    assert client.retries == 1
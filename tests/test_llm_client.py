@@ -0,0 +1,139 @@
+"""
+tests/test_llm_client.py
+────────────────────────
+Unit tests for the SSE streaming reader, served by httpx.MockTransport
+(no network, no API key).
+Run with: pytest tests/ -v
+"""
+
+import asyncio
+import json
+
+import httpx
+import orjson
+import pytest
+import pytest_asyncio
+
+from app.core.config import settings
+from app.services.llm_client import LLMAPIError, LLMClient, LLMParseError
+from app.services.validator import parse_and_validate
+
+
+CASE = {
+    "title": "Caso con {llaves} y \"comillas\"",
+    "preconditions": "Usuario en la página ] de registro",
+    "steps": ["Paso uno", "Paso dos"],
+    "expected_result": "Se muestra el mensaje de confirmación",
+}
+
+
+# ── SSE streaming (_post_stream) ─────────────────────────────────────────────
+
+def sse_body(text: str, size: int = 40, finish_reason: str = "stop") -> bytes:
+    """Splits `text` into content deltas, framed the way the Chat Completions API streams them."""
+    events = [
+        {"model": "test-model", "choices": [{"delta": {"content": text[i:i + size]}, "finish_reason": None}]}
+        for i in range(0, len(text), size)
+    ]
+    events.append({"model": "test-model", "choices": [{"delta": {}, "finish_reason": finish_reason}]})
+    lines = [b"data: " + orjson.dumps(e) for e in events] + [b"data: [DONE]"]
+    return b"\n\n".join(lines) + b"\n\n"
+
+
+def cases_json(n: int) -> str:
+    return json.dumps({"test_cases": [CASE] * n}, ensure_ascii=False)
+
+
+@pytest_asyncio.fixture
+async def make_client():
+    clients = []
+
+    def factory(status: int, body: bytes) -> LLMClient:
+        client = LLMClient()
+        client._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(status, content=body))
+        )
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_after_expected_cases(monkeypatch, make_client):
+    monkeypatch.setattr(settings, "EXPECTED_TEST_CASES", 4)
+    client = make_client(200, sse_body(cases_json(6)))
+
+    resp = await client.generate("Como usuario quiero registrarme", stream=True)
+
+    assert resp.stop_reason == "stop"
+    assert resp.model == "test-model"
+    assert json.loads(resp.text) == {"test_cases": [CASE] * 4}
+    output, repaired = parse_and_validate(resp.text, resp.stop_reason)
+    assert len(output.test_cases) == 4 and repaired is False
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_early_on_fenced_output(monkeypatch, make_client):
+    monkeypatch.setattr(settings, "EXPECTED_TEST_CASES", 4)
+    client = make_client(200, sse_body(f"```json\n{cases_json(6)}\n```"))
+
+    resp = await client.generate("Como usuario quiero registrarme", stream=True)
+
+    output, _ = parse_and_validate(resp.text, resp.stop_reason)
+    assert len(output.test_cases) == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_with_fewer_cases_returns_full_text(monkeypatch, make_client):
+    monkeypatch.setattr(settings, "EXPECTED_TEST_CASES", 4)
+    text = cases_json(2)
+    client = make_client(200, sse_body(text, finish_reason="length"))
+
+    resp = await client.generate("Como usuario quiero registrarme", stream=True)
+
+    assert resp.text == text
+    assert resp.stop_reason == "length"
+
+
+@pytest.mark.asyncio
+async def test_stream_rate_limited_raises_api_error(make_client):
+    client = make_client(429, b'{"error": {"message": "Rate limit reached"}}')
+
+    with pytest.raises(LLMAPIError):
+        await client.generate("Como usuario quiero registrarme", stream=True)
+    assert client.metrics.rate_limited == 1
+    assert client.metrics.inflight == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_malformed_chunk_raises_parse_error(make_client):
+    client = make_client(200, b"data: {oops\n\n")
+
+    with pytest.raises(LLMParseError):
+        await client.generate("Como usuario quiero registrarme", stream=True)
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_requests_waiting_for_a_slot(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_CONCURRENCY", 1)
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, content=sse_body(cases_json(1)))
+
+    client = LLMClient()
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        tasks = [asyncio.create_task(client.generate("Como usuario quiero entrar", stream=True)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert (client.metrics.inflight, client.metrics.queued) == (1, 2)
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert (client.metrics.inflight, client.metrics.queued, client.metrics.requests) == (0, 0, 3)
+    finally:
+        await client.aclose()
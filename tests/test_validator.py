@@ -5,10 +5,15 @@ Unit tests for JSON repair and structural validation.
 Run with: pytest tests/ -v
 """
 
+import json
+
 import pytest
+from pydantic import TypeAdapter
 
-from app.services.validator import repair_truncated_json, parse_and_validate, strip_fences
+from app.core.models import TestCase
 from app.services.llm_client import LLMParseError
+from app.services.scorer import score_test_cases
+from app.services.validator import _JsonScanner, repair_truncated_json, parse_and_validate, strip_fences
 
 
 # ── strip_fences ─────────────────────────────────────────────────────────────
@@ -25,14 +30,15 @@ def test_strip_fences_noop_on_clean():
 
 # ── repair_truncated_json ────────────────────────────────────────────────────
 
-VALID_CASE = {
-    "title": "Happy Path",
-    "preconditions": "User has a valid account and is on the login page",
-    "steps": ["Enter email", "Enter password", "Click login"],
-    "expected_result": "User is redirected to the dashboard and sees a welcome message",
-}
-
-VALID_JSON = '{"test_cases": [' + str(VALID_CASE).replace("'", '"') + ']}'
+# Fixtures are kept pre-serialized: immutable str constants, nothing to encode per test
+VALID_JSON = (
+    '{"test_cases":[{'
+    '"title":"Happy Path",'
+    '"preconditions":"User has a valid account and is on the login page",'
+    '"steps":["Enter email","Enter password","Click login"],'
+    '"expected_result":"User is redirected to the dashboard and sees a welcome message"'
+    '}]}'
+)
 
 
 def test_repair_valid_json_passthrough():
@@ -43,9 +49,9 @@ def test_repair_valid_json_passthrough():
 def test_repair_truncated_mid_string():
     # Simulate truncation mid-string
     truncated = '{"test_cases": [{"title": "Happy Path", "preconditions": "User logged in", "steps": ["Step 1"], "expected_result": "User sees dash'
-    with pytest.raises(Exception):
-        # We expect repair to either succeed or raise JSONDecodeError
+    with pytest.raises(json.JSONDecodeError):
         # The truncated case here is too minimal to repair fully
+        # (orjson.JSONDecodeError subclasses json.JSONDecodeError)
         repair_truncated_json(truncated)
 
 
@@ -55,41 +61,98 @@ def test_repair_with_trailing_comma():
     assert "test_cases" in data
 
 
-# ── parse_and_validate ───────────────────────────────────────────────────────
+def test_repair_with_trailing_comma_before_whitespace():
+    raw = '{"test_cases": [{"title": "T", "steps": ["s1", "s2" ,\n ],\n },\n]}'
+    data = repair_truncated_json(raw)
+    assert data == {"test_cases": [{"title": "T", "steps": ["s1", "s2"]}]}
 
-FULL_VALID_PAYLOAD = {
-    "test_cases": [
-        {
-            "title": "Happy Path Login",
-            "preconditions": "User has a verified account with correct credentials on the login page",
-            "steps": ["Enter valid email address", "Enter correct password", "Click the Login button"],
-            "expected_result": "User is redirected to the dashboard and a welcome banner is displayed",
-        },
-        {
-            "title": "Invalid Password Error",
-            "preconditions": "User account exists but user enters wrong password on login page",
-            "steps": ["Enter valid email", "Enter incorrect password", "Click Login"],
-            "expected_result": "Error message 'Invalid credentials' appears; user stays on login page",
-        },
-    ]
+
+def test_repair_ignores_delimiters_inside_strings():
+    raw = '{"test_cases": [], "note": "closes with } and \\" then ]'
+    data = repair_truncated_json(raw)
+    assert data == {"test_cases": []}
+
+
+# ── _JsonScanner (shared by repair and the SSE reader) ──────────────────────
+
+_SCAN_CASE = {
+    "title": "Caso con {llaves} y \"comillas\"",
+    "preconditions": "Usuario en la página ] de registro",
+    "steps": ["Paso uno", "Paso dos"],
+    "expected_result": "Se muestra el mensaje de confirmación",
 }
 
-import json
+
+def feed_in_chunks(text: str, size: int) -> _JsonScanner:
+    scanner = _JsonScanner()
+    for i in range(0, len(text), size):
+        scanner.feed(text[i:i + size])
+    return scanner
+
+
+def test_scanner_counts_complete_cases_across_chunks():
+    text = json.dumps({"test_cases": [_SCAN_CASE] * 3}, ensure_ascii=False)
+    for size in (1, 5, 64):
+        assert feed_in_chunks(text, size).cases == 3
+
+
+def test_scanner_close_yields_valid_document():
+    text = json.dumps({"test_cases": [_SCAN_CASE] * 2}, ensure_ascii=False)
+    partial = text[: text.index("Paso dos", len(text) // 2)]   # mid-way through the 2nd case
+    scanner = feed_in_chunks(partial, 7)
+    assert scanner.cases == 1
+    assert json.loads(scanner.close(partial)) == {"test_cases": [_SCAN_CASE]}
+
+
+# ── parse_and_validate ───────────────────────────────────────────────────────
+
+_FULL_VALID_JSON = (
+    '{"test_cases": ['
+    '{"title": "Happy Path Login", '
+    '"preconditions": "User has a verified account with correct credentials on the login page", '
+    '"steps": ["Enter valid email address", "Enter correct password", "Click the Login button"], '
+    '"expected_result": "User is redirected to the dashboard and a welcome banner is displayed"}, '
+    '{"title": "Invalid Password Error", '
+    '"preconditions": "User account exists but user enters wrong password on login page", '
+    '"steps": ["Enter valid email", "Enter incorrect password", "Click Login"], '
+    '"expected_result": "Error message \'Invalid credentials\' appears; user stays on login page"}'
+    ']}'
+)
+_FULL_VALID_JSON_FENCED = f"```json\n{_FULL_VALID_JSON}\n```"
 
 
 def test_parse_and_validate_clean_json():
-    raw = json.dumps(FULL_VALID_PAYLOAD)
-    output, repaired = parse_and_validate(raw, stop_reason="stop")
+    output, repaired = parse_and_validate(_FULL_VALID_JSON, stop_reason="stop")
     assert len(output.test_cases) == 2
     assert repaired is False
 
 
 def test_parse_and_validate_with_fences():
-    raw = "```json\n" + json.dumps(FULL_VALID_PAYLOAD) + "\n```"
-    output, repaired = parse_and_validate(raw, stop_reason="stop")
+    output, repaired = parse_and_validate(_FULL_VALID_JSON_FENCED, stop_reason="stop")
     assert len(output.test_cases) == 2
 
 
+def test_parse_and_validate_drops_partial_case_on_length():
+    # Two complete cases, cut off partway through the third
+    truncated = _FULL_VALID_JSON[:-2] + ', {"title": "Third case", "steps": ["Open the page"'
+    output, repaired = parse_and_validate(truncated, stop_reason="length")
+    assert [tc.title for tc in output.test_cases] == ["Happy Path Login", "Invalid Password Error"]
+    assert repaired is True
+
+
+def test_parse_and_validate_truncated_right_after_opening_brace():
+    output, repaired = parse_and_validate(_FULL_VALID_JSON[:-2] + ", {", stop_reason="length")
+    assert len(output.test_cases) == 2
+    assert repaired is True
+
+
+def test_parse_and_validate_raises_when_only_case_is_truncated():
+    truncated = '{"test_cases": [{"title": "Happy Path", "preconditions": "User logged in", "steps": ["Step 1"], "expected_result": "User sees dash'
+    # The only case is incomplete, so repair has no whole test case to keep
+    with pytest.raises(LLMParseError):
+        parse_and_validate(truncated, stop_reason="length")
+
+
 def test_parse_and_validate_raises_on_garbage():
     with pytest.raises(LLMParseError):
         parse_and_validate("this is not json at all !!!", stop_reason="stop")
@@ -101,55 +164,77 @@ def test_parse_and_validate_raises_on_missing_key():
         parse_and_validate(raw, stop_reason="stop")
 
 
+@pytest.mark.parametrize("step", ["", "   ", "\t\n", "\u00a0\u3000", "\x1c\x1d"])
+def test_parse_and_validate_rejects_whitespace_only_step(step):
+    raw = json.dumps({"test_cases": [{
+        "title": "Happy Path Login",
+        "preconditions": "User has a verified account on the login page",
+        "steps": ["Enter valid email address", step],
+        "expected_result": "User is redirected to the dashboard",
+    }]})
+    with pytest.raises(LLMParseError):
+        parse_and_validate(raw, stop_reason="stop")
+
+
 # ── scorer ───────────────────────────────────────────────────────────────────
 
-from app.services.scorer import score_test_cases
-from app.core.models import TestCase
+_DEFAULT_STEPS = ("Step one action", "Step two action", "Step three action")
+_DEFAULT_TC_DATA = {
+    "title": "Test Case Title",
+    "preconditions": "User is on the registration page with valid data",
+    "steps": _DEFAULT_STEPS,
+    "expected_result": "System displays confirmation and sends verification email to user",
+}
+_TC_LIST_ADAPTER = TypeAdapter(list[TestCase])
 
 
 def make_tc(**kwargs) -> TestCase:
-    defaults = {
-        "title": "Test Case Title",
-        "preconditions": "User is on the registration page with valid data",
-        "steps": ["Step one action", "Step two action", "Step three action"],
-        "expected_result": "System displays confirmation and sends verification email to user",
-    }
-    return TestCase(**{**defaults, **kwargs})
+    # Validated like LLM output, so scorer tests only see values the schema can deliver
+    return TestCase.model_validate({**_DEFAULT_TC_DATA, **kwargs})
 
 
-def test_score_high_quality():
-    cases = [
+def _cases_high_quality():
+    return [
         make_tc(title="Happy Path Registration"),
         make_tc(title="Email Already Registered Error"),
         make_tc(title="Edge Case Empty Form Submission"),
         make_tc(title="Security SQL Injection Attempt"),
     ]
-    report = score_test_cases(cases)
-    assert report.score >= 0.70
-    assert report.label == "Alta calidad"
 
 
-def test_score_vague_expected_results():
-    cases = [
+def _cases_vague_expected_results():
+    return [
         make_tc(expected_result="It works correctly and everything is ok"),
         make_tc(expected_result="Works fine and success is shown"),
     ]
-    report = score_test_cases(cases)
-    assert report.dimensions.expected_results < 0.8
 
 
-def test_score_generic_preconditions():
-    cases = [
-        make_tc(preconditions="N/A"),
+def _cases_generic_preconditions():
+    return [
+        make_tc(preconditions="No aplica"),
         make_tc(preconditions="the user is logged in"),
     ]
-    report = score_test_cases(cases)
-    assert report.dimensions.preconditions < 0.5
 
 
-def test_score_dimensions_in_range():
-    cases = [make_tc() for _ in range(4)]
-    report = score_test_cases(cases)
-    d = report.dimensions
-    for val in [d.quantity, d.steps_depth, d.preconditions, d.expected_results, d.diversity]:
-        assert 0.0 <= val <= 1.0
+def _cases_uniform():
+    return _TC_LIST_ADAPTER.validate_python([_DEFAULT_TC_DATA] * 4)
+
+
+def _dimensions_in_range(report) -> bool:
+    # Iterates every QualityDimension field, so new dimensions are covered automatically
+    return all(0.0 <= val <= 1.0 for val in report.dimensions.model_dump().values())
+
+
+# Case lists are built inside each param (not at import) so a fixture that fails
+# TestCase validation only fails its own param instead of the whole module.
+@pytest.mark.parametrize(
+    "build_cases, check",
+    [
+        pytest.param(_cases_high_quality, lambda r: r.score >= 0.70 and r.label == "Alta calidad", id="high_quality"),
+        pytest.param(_cases_vague_expected_results, lambda r: r.dimensions.expected_results < 0.8, id="vague_expected_results"),
+        pytest.param(_cases_generic_preconditions, lambda r: r.dimensions.preconditions < 0.5, id="generic_preconditions"),
+        pytest.param(_cases_uniform, _dimensions_in_range, id="dimensions_in_range"),
+    ],
+)
+def test_score(build_cases, check):
+    assert check(score_test_cases(build_cases()))